@@ -1,29 +1,37 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from cachetools import TTLCache
+from passlib.context import CryptContext
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 from datetime import datetime, timedelta
 import os
+import asyncio
 import uuid
 import jwt
 import hashlib
 import logging
+import time
 from pathlib import Path
 from dotenv import load_dotenv
-import shutil
+import aiofiles
+import orjson
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app
-app = FastAPI(title="Job Portal API")
+app = FastAPI(title="Job Portal API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -33,9 +41,27 @@ security = HTTPBearer()
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 
+# New passwords use bcrypt; legacy unsalted SHA-256 hashes still verify and are upgraded on login
+pwd_context = CryptContext(schemes=["bcrypt", "hex_sha256"], deprecated="auto")
+
+# Short-lived cache of authenticated users, keyed by the token's SHA-256 digest
+_user_cache = TTLCache(maxsize=10000, ttl=5)
+
+# Recently read active jobs, keyed by job id; dropped on update/delete
+_job_cache = TTLCache(maxsize=5000, ttl=30)
+# Bumped on every job write so a lookup that raced the write doesn't re-cache the old document
+_job_versions: dict = {}
+
 # Create upload directory
 UPLOAD_DIR = Path("/tmp/uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+ALLOWED_RESUME_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+})
+ALLOWED_RESUME_EXTENSIONS = frozenset({".pdf", ".doc", ".docx"})
 
 # Models
 class UserRole(str):
@@ -44,7 +70,7 @@ class UserRole(str):
     ADMIN = "admin"
 
 class User(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(ObjectId()))
     email: EmailStr
     password_hash: str
     role: str
@@ -54,6 +80,9 @@ class User(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     is_active: bool = True
 
+# Fields returned to clients; password_hash never leaves the server
+USER_PUBLIC_FIELDS = ("id", "email", "role", "full_name", "company_name", "phone", "created_at", "is_active")
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -67,7 +96,7 @@ class UserLogin(BaseModel):
     password: str
 
 class Job(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(ObjectId()))
     title: str
     company: str
     location: str
@@ -91,16 +120,17 @@ class JobCreate(BaseModel):
     job_type: str = "full-time"
 
 class Resume(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(ObjectId()))
     user_id: str
     filename: str
     file_path: str
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
 class Application(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(ObjectId()))
     job_id: str
     candidate_id: str
+    employer_id: Optional[str] = None
     resume_id: str
     cover_letter: Optional[str] = None
     status: str = "pending"  # pending, reviewed, accepted, rejected
@@ -113,11 +143,11 @@ class ApplicationCreate(BaseModel):
     cover_letter: Optional[str] = None
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+def public_user(user: dict) -> dict:
+    return {field: user.get(field) for field in USER_PUBLIC_FIELDS}
 
-def verify_password(password: str, hashed: str) -> bool:
-    return hash_password(password) == hashed
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -130,6 +160,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    key = hashlib.sha256(credentials.credentials.encode()).digest()
+    cached = _user_cache.get(key)
+    # The token's own expiry still applies to cached entries
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -138,14 +173,53 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         user = await db.users.find_one({"id": user_id})
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return User(**user)
+        user = User(**user)
+        _user_cache[key] = (user, payload.get("exp", 0))
+        return user
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
+async def get_active_job(job_id: str) -> Optional[dict]:
+    job = _job_cache.get(job_id)
+    if job is None:
+        version = _job_versions.get(job_id, 0)
+        job = await db.jobs.find_one({"id": job_id, "is_active": True}, {"_id": 0})
+        if job is not None and _job_versions.get(job_id, 0) == version:
+            _job_cache[job_id] = job
+    return job
+
+def invalidate_job(job_id: str):
+    _job_versions[job_id] = _job_versions.get(job_id, 0) + 1
+    _job_cache.pop(job_id, None)
+
+async def employer_owns_application(application: dict, employer_id: str) -> bool:
+    # Applications created before employer_id was stored need the job lookup
+    if application.get("employer_id") is not None:
+        return application["employer_id"] == employer_id
+    job = await db.jobs.find_one({"id": application["job_id"], "employer_id": employer_id}, {"_id": 0, "id": 1})
+    return job is not None
+
+async def stream_json_array(cursor) -> Response:
+    """Encode a cursor as a JSON array one document at a time."""
+    # Run the query before the 200 headers go out so its errors still become 500s
+    first = await anext(cursor, None)
+    if first is None:
+        return Response(content=b"[]", media_type="application/json")
+    
+    async def generate():
+        yield b"[" + orjson.dumps(first)
+        async for doc in cursor:
+            yield b"," + orjson.dumps(doc)
+        yield b"]"
+    return StreamingResponse(generate(), media_type="application/json")
+
 # Basic endpoints
+# Health checks hit this often, so the body is encoded once
+_ROOT_BODY = orjson.dumps({"message": "Job Portal API is running"})
+
 @api_router.get("/")
 async def root():
-    return {"message": "Job Portal API is running"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 # Authentication endpoints
 @api_router.post("/register")
@@ -156,31 +230,45 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    user_dict = user_data.dict()
-    user_dict["password_hash"] = hash_password(user_data.password)
-    del user_dict["password"]
+    user_dict = user_data.model_dump(exclude={"password"})
+    user_dict["password_hash"] = await asyncio.to_thread(hash_password, user_data.password)
     
-    user = User(**user_dict)
-    await db.users.insert_one(user.dict())
+    user = User(**user_dict).model_dump()
+    try:
+        await db.users.insert_one(user)
+    except DuplicateKeyError:
+        # A concurrent registration won the race on the unique email index
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create access token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": user["id"]})
     
-    return {"access_token": access_token, "token_type": "bearer", "user": user.dict()}
+    return {"access_token": access_token, "token_type": "bearer", "user": public_user(user)}
 
 @api_router.post("/login")
 async def login(user_data: UserLogin):
     user = await db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password_hash"]):
+    if not user:
+        # Spend the same hashing time as a real check so unknown emails aren't distinguishable
+        await asyncio.to_thread(pwd_context.dummy_verify)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    # bcrypt is deliberately slow, so keep it off the event loop
+    verified, new_hash = await asyncio.to_thread(
+        pwd_context.verify_and_update, user_data.password, user["password_hash"]
+    )
+    if not verified:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        await db.users.update_one({"id": user["id"]}, {"$set": {"password_hash": new_hash}})
     
     access_token = create_access_token(data={"sub": user["id"]})
     
-    return {"access_token": access_token, "token_type": "bearer", "user": User(**user).dict()}
+    return {"access_token": access_token, "token_type": "bearer", "user": public_user(user)}
 
 @api_router.get("/me")
 async def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+    return {field: getattr(current_user, field) for field in USER_PUBLIC_FIELDS}
 
 # Job endpoints
 @api_router.post("/jobs")
@@ -188,49 +276,44 @@ async def create_job(job_data: JobCreate, current_user: User = Depends(get_curre
     if current_user.role != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can create jobs")
     
-    job_dict = job_data.dict()
+    job_dict = job_data.model_dump()
     job_dict["employer_id"] = current_user.id
     job = Job(**job_dict)
     
-    await db.jobs.insert_one(job.dict())
+    await db.jobs.insert_one(job.model_dump())
     return job
 
 @api_router.get("/jobs")
 async def get_jobs(skip: int = 0, limit: int = 50, search: Optional[str] = None):
     query = {"is_active": True}
     if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"company": {"$regex": search, "$options": "i"}},
-            {"location": {"$regex": search, "$options": "i"}}
-        ]
+        query["$text"] = {"$search": search}
     
-    jobs = await db.jobs.find(query).skip(skip).limit(limit).to_list(limit)
-    return [Job(**job) for job in jobs]
+    # Documents were validated on write, so stream them out as-is
+    return await stream_json_array(db.jobs.find(query, {"_id": 0}).skip(skip).limit(limit))
 
 @api_router.get("/jobs/{job_id}")
 async def get_job(job_id: str):
-    job = await db.jobs.find_one({"id": job_id, "is_active": True})
+    job = await get_active_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return Job(**job)
+    return job
 
 @api_router.put("/jobs/{job_id}")
 async def update_job(job_id: str, job_data: JobCreate, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can update jobs")
     
-    job = await db.jobs.find_one({"id": job_id, "employer_id": current_user.id})
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    await db.jobs.update_one(
-        {"id": job_id}, 
-        {"$set": job_data.dict()}
+    updated_job = await db.jobs.find_one_and_update(
+        {"id": job_id, "employer_id": current_user.id},
+        {"$set": job_data.model_dump()},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_job = await db.jobs.find_one({"id": job_id})
-    return Job(**updated_job)
+    if not updated_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    invalidate_job(job_id)
+    return updated_job
 
 @api_router.delete("/jobs/{job_id}")
 async def delete_job(job_id: str, current_user: User = Depends(get_current_user)):
@@ -245,6 +328,7 @@ async def delete_job(job_id: str, current_user: User = Depends(get_current_user)
         {"id": job_id}, 
         {"$set": {"is_active": False}}
     )
+    invalidate_job(job_id)
     
     return {"message": "Job deleted successfully"}
 
@@ -254,18 +338,19 @@ async def upload_resume(file: UploadFile = File(...), current_user: User = Depen
     if current_user.role != UserRole.CANDIDATE:
         raise HTTPException(status_code=403, detail="Only candidates can upload resumes")
     
-    # Check file type
-    if not file.content_type.startswith(('application/pdf', 'application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')):
+    # Check file type and extension
+    file_extension = Path(file.filename or "").suffix.lower()
+    if file.content_type not in ALLOWED_RESUME_TYPES or file_extension not in ALLOWED_RESUME_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Only PDF and Word documents are allowed")
     
     # Generate unique filename
-    file_extension = file.filename.split('.')[-1]
-    filename = f"{current_user.id}_{uuid.uuid4()}.{file_extension}"
+    filename = f"{current_user.id}_{uuid.uuid4()}{file_extension}"
     file_path = UPLOAD_DIR / filename
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file in chunks without blocking the event loop
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
     
     # Save resume record
     resume = Resume(
@@ -274,7 +359,7 @@ async def upload_resume(file: UploadFile = File(...), current_user: User = Depen
         file_path=str(file_path)
     )
     
-    await db.resumes.insert_one(resume.dict())
+    await db.resumes.insert_one(resume.model_dump())
     return resume
 
 @api_router.get("/resumes")
@@ -282,8 +367,29 @@ async def get_user_resumes(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.CANDIDATE:
         raise HTTPException(status_code=403, detail="Only candidates can view resumes")
     
-    resumes = await db.resumes.find({"user_id": current_user.id}).to_list(100)
-    return [Resume(**resume) for resume in resumes]
+    return await db.resumes.find({"user_id": current_user.id}, {"_id": 0}).to_list(100)
+
+@api_router.get("/resumes/{resume_id}/download")
+async def download_resume(resume_id: str, current_user: User = Depends(get_current_user)):
+    resume = await db.resumes.find_one({"id": resume_id})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    # Check permissions: the owner, or an employer the resume was submitted to
+    if current_user.role == UserRole.CANDIDATE and resume["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    elif current_user.role == UserRole.EMPLOYER:
+        job_ids = await db.applications.distinct("job_id", {"resume_id": resume_id})
+        job = await db.jobs.find_one({"id": {"$in": job_ids}, "employer_id": current_user.id})
+        if not job:
+            raise HTTPException(status_code=403, detail="Access denied")
+    
+    # Uploads live under /tmp and may have been wiped since the record was written
+    if not Path(resume["file_path"]).is_file():
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    
+    # FileResponse streams from disk without reading the whole file into memory
+    return FileResponse(resume["file_path"], filename=resume["filename"])
 
 # Application endpoints
 @api_router.post("/applications")
@@ -291,45 +397,47 @@ async def apply_for_job(application_data: ApplicationCreate, current_user: User
     if current_user.role != UserRole.CANDIDATE:
         raise HTTPException(status_code=403, detail="Only candidates can apply for jobs")
     
-    # Check if job exists
-    job = await db.jobs.find_one({"id": application_data.job_id, "is_active": True})
+    # Check that the job exists and the resume belongs to the user, concurrently
+    job, resume = await asyncio.gather(
+        get_active_job(application_data.job_id),
+        db.resumes.find_one({"id": application_data.resume_id, "user_id": current_user.id}, {"_id": 0, "id": 1}),
+    )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Check if resume exists and belongs to user
-    resume = await db.resumes.find_one({"id": application_data.resume_id, "user_id": current_user.id})
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Check if already applied
-    existing_application = await db.applications.find_one({
-        "job_id": application_data.job_id,
-        "candidate_id": current_user.id
-    })
-    if existing_application:
-        raise HTTPException(status_code=400, detail="Already applied for this job")
-    
-    # Create application
-    application_dict = application_data.dict()
+    # Create application (duplicates are rejected by the unique job_id/candidate_id index)
+    application_dict = application_data.model_dump()
     application_dict["candidate_id"] = current_user.id
+    application_dict["employer_id"] = job["employer_id"]
     application = Application(**application_dict)
     
-    await db.applications.insert_one(application.dict())
+    try:
+        await db.applications.insert_one(application.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied for this job")
     return application
 
 @api_router.get("/applications")
 async def get_applications(current_user: User = Depends(get_current_user)):
     if current_user.role == UserRole.CANDIDATE:
-        applications = await db.applications.find({"candidate_id": current_user.id}).to_list(100)
+        applications = db.applications.find({"candidate_id": current_user.id}, {"_id": 0}).limit(100)
     elif current_user.role == UserRole.EMPLOYER:
-        # Get applications for employer's jobs
-        employer_jobs = await db.jobs.find({"employer_id": current_user.id}).to_list(100)
-        job_ids = [job["id"] for job in employer_jobs]
-        applications = await db.applications.find({"job_id": {"$in": job_ids}}).to_list(100)
+        # Join employer's jobs to their applications in a single round-trip
+        pipeline = [
+            {"$match": {"employer_id": current_user.id}},
+            {"$lookup": {"from": "applications", "localField": "id", "foreignField": "job_id", "as": "apps"}},
+            {"$unwind": "$apps"},
+            {"$replaceRoot": {"newRoot": "$apps"}},
+            {"$project": {"_id": 0}},
+            {"$limit": 100},
+        ]
+        applications = await db.jobs.aggregate(pipeline)
     else:
-        applications = await db.applications.find({}).to_list(100)
+        applications = db.applications.find({}, {"_id": 0}).limit(100)
     
-    return [Application(**app) for app in applications]
+    return await stream_json_array(applications)
 
 @api_router.get("/applications/{application_id}")
 async def get_application(application_id: str, current_user: User = Depends(get_current_user)):
@@ -340,10 +448,8 @@ async def get_application(application_id: str, current_user: User = Depends(get_
     # Check permissions
     if current_user.role == UserRole.CANDIDATE and application["candidate_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
-    elif current_user.role == UserRole.EMPLOYER:
-        job = await db.jobs.find_one({"id": application["job_id"], "employer_id": current_user.id})
-        if not job:
-            raise HTTPException(status_code=403, detail="Access denied")
+    elif current_user.role == UserRole.EMPLOYER and not await employer_owns_application(application, current_user.id):
+        raise HTTPException(status_code=403, detail="Access denied")
     
     return Application(**application)
 
@@ -357,26 +463,34 @@ async def update_application_status(
     if current_user.role != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail="Only employers can update application status")
     
+    update_data = {"status": status}
+    if notes:
+        update_data["notes"] = notes
+    
+    # Ownership check and write in one round trip for applications that carry employer_id
+    updated_application = await db.applications.find_one_and_update(
+        {"id": application_id, "employer_id": current_user.id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_application:
+        return updated_application
+    
+    # Missing, someone else's, or a legacy application without employer_id
     application = await db.applications.find_one({"id": application_id})
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    # Check if employer owns the job
-    job = await db.jobs.find_one({"id": application["job_id"], "employer_id": current_user.id})
-    if not job:
+    if application.get("employer_id") is not None or not await employer_owns_application(application, current_user.id):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    update_data = {"status": status}
-    if notes:
-        update_data["notes"] = notes
-    
-    await db.applications.update_one(
+    return await db.applications.find_one_and_update(
         {"id": application_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_application = await db.applications.find_one({"id": application_id})
-    return Application(**updated_application)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -396,6 +510,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.jobs.create_index("id", unique=True)
+    await db.jobs.create_index([("is_active", 1), ("posted_at", -1)])
+    await db.jobs.create_index("employer_id")
+    await db.jobs.create_index([("title", "text"), ("company", "text"), ("location", "text")])
+    await db.resumes.create_index("id", unique=True)
+    await db.resumes.create_index("user_id")
+    await db.applications.create_index("id", unique=True)
+    await db.applications.create_index([("job_id", 1), ("candidate_id", 1)], unique=True)
+    await db.applications.create_index("candidate_id")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await client.close()
\ No newline at end of file
@@ -1,157 +1,301 @@
+import asyncio
+import functools
+import httpx
+import orjson
+import pytest
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 import unittest
 import uuid
+import io
 import os
+import shutil
 import time
+import logging
+import vcr
 from datetime import datetime
+from pathlib import Path
 
+logging.basicConfig(level=os.getenv("TEST_LOG_LEVEL", "WARNING"))
+logger = logging.getLogger(__name__)
+
+# Recorded HTTP interactions for offline replay. The first run (or RECORD=1)
+# records against the live backend; later runs replay from disk. LIVE=1 talks
+# to the backend without recording or replaying anything.
+# Each recording lives in its own .vcr/<run_id>/ directory and .vcr/latest
+# names the one to replay, so concurrent runs never touch each other's files.
+VCR_DIR = Path(__file__).with_name(".vcr")
+LATEST_RUN_PATH = VCR_DIR / "latest"
+CASSETTE_NAME = "backend_test.yaml"
+LIVE = os.getenv("LIVE") == "1"
+RECORD = os.getenv("RECORD") == "1"
+VCR_RECORD_MODE = os.getenv("VCR_RECORD_MODE", "once")
+REQUEST_TIMEOUT = 30.0
+
+def _json(response):
+    return orjson.loads(response.content)
+
+def _recorded_run_id():
+    """Return the run id of the latest complete recording, if there is one."""
+    try:
+        run_id = LATEST_RUN_PATH.read_text().strip()
+    except FileNotFoundError:
+        return None
+    return run_id if (VCR_DIR / run_id / CASSETTE_NAME).is_file() else None
+
+def _publish_recording(run_id):
+    # Swap the pointer atomically so a concurrent replay never sees a half-written one
+    if (VCR_DIR / run_id / CASSETTE_NAME).is_file():
+        pending = LATEST_RUN_PATH.with_name(f"latest.{run_id}")
+        pending.write_text(run_id)
+        os.replace(pending, LATEST_RUN_PATH)
+
+def _scrub_tokens(response):
+    """Keep bearer tokens returned by /register and /login out of the cassette."""
+    try:
+        data = orjson.loads(response["body"]["string"])
+    except (orjson.JSONDecodeError, TypeError):
+        return response
+    if isinstance(data, dict) and "access_token" in data:
+        data["access_token"] = "<filtered>"
+        body = orjson.dumps(data)
+        response["body"]["string"] = body
+        # Replay must not promise more bytes than the scrubbed body has
+        for name in response["headers"]:
+            if name.lower() == "content-length":
+                response["headers"][name] = [str(len(body))]
+    return response
+
+# The tests form one ordered chain sharing class state, so pytest-xdist must
+# keep them on a single worker (pytest.ini selects --dist=loadgroup)
+@pytest.mark.xdist_group("job_portal_api")
 class JobPortalAPITest(unittest.TestCase):
-    def setUp(self):
-        # Get the backend URL from the frontend .env file
-        self.base_url = "https://c4f25dc9-7997-4cde-a260-2915b9b0eca8.preview.emergentagent.com/api"
-        self.candidate_token = None
-        self.employer_token = None
-        self.candidate_user = None
-        self.employer_user = None
-        self.test_job_id = None
-        self.test_resume_id = None
-        self.test_application_id = None
-        
-        # Generate unique test users
-        self.timestamp = int(time.time())
-        self.candidate_email = f"candidate_{self.timestamp}@test.com"
-        self.employer_email = f"employer_{self.timestamp}@test.com"
-        self.password = "Test123!"
+    @classmethod
+    def setUpClass(cls):
+        # Generate unique test users, also across concurrent pytest-xdist workers
+        # (a replay reuses the recorded run's id so the recorded emails still match)
+        cls.passed_tests = set()
+        replay_run_id = None if LIVE or RECORD or VCR_RECORD_MODE == "all" else _recorded_run_id()
+        if replay_run_id:
+            cls.run_id = replay_run_id
+            cls.timestamp = int(cls.run_id.split("_")[0])
+        else:
+            cls.timestamp = int(time.time())
+            cls.run_id = f"{cls.timestamp}_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+        
+        if not LIVE:
+            if not replay_run_id:
+                # Cleanups run in reverse, so this runs after the cassette is saved
+                cls.addClassCleanup(cls._finish_recording)
+            cassette = vcr.use_cassette(
+                str(VCR_DIR / cls.run_id / CASSETTE_NAME),
+                record_mode=VCR_RECORD_MODE,
+                decode_compressed_response=True,
+                filter_headers=["Authorization"],
+                filter_post_data_parameters=["password"],
+                before_record_response=_scrub_tokens
+            )
+            cassette.__enter__()
+            cls.addClassCleanup(cassette.__exit__, None, None, None)
+        
+        # One keep-alive connection pool for the whole run, retrying transient
+        # gateway errors in place instead of failing the whole ordered chain
+        retry = Retry(
+            total=3, connect=3, read=3, status=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"])
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        cls.session = requests.Session()
+        cls.session.mount("https://", adapter)
+        cls.session.mount("http://", adapter)
         
-        print(f"\n🔍 Using base URL: {self.base_url}")
-        print(f"🔍 Test candidate email: {self.candidate_email}")
-        print(f"🔍 Test employer email: {self.employer_email}")
+        # Get the backend URL from the frontend .env file
+        cls.base_url = "https://c4f25dc9-7997-4cde-a260-2915b9b0eca8.preview.emergentagent.com/api"
+        cls.URL_ROOT = f"{cls.base_url}/"
+        cls.URL_REGISTER = f"{cls.base_url}/register"
+        cls.URL_LOGIN = f"{cls.base_url}/login"
+        cls.URL_ME = f"{cls.base_url}/me"
+        cls.URL_JOBS = f"{cls.base_url}/jobs"
+        cls.URL_RESUMES = f"{cls.base_url}/resumes"
+        cls.URL_RESUME_UPLOAD = f"{cls.base_url}/resumes/upload"
+        cls.URL_APPS = f"{cls.base_url}/applications"
+        
+        # The resume upload streams a one-shot body that cannot be rewound, so
+        # only retry failed connects (nothing sent yet), never reads or 5xx
+        cls.session.mount(cls.URL_RESUME_UPLOAD, HTTPAdapter(
+            max_retries=Retry(connect=3, read=0, status=0, backoff_factor=0.3)
+        ))
+        
+        # State shared by the ordered tests; kept on the class so it survives
+        # unittest creating a fresh instance for every test method
+        cls.candidate_token = None
+        cls.employer_token = None
+        cls.candidate_headers = None
+        cls.employer_headers = None
+        cls.candidate_user = None
+        cls.employer_user = None
+        cls.test_job_id = None
+        cls.test_resume_id = None
+        cls.test_application_id = None
+        
+        cls.candidate_email = f"candidate_{cls.run_id}@test.com"
+        cls.employer_email = f"employer_{cls.run_id}@test.com"
+        cls.password = "Test123!"
+        
+        logger.debug("🔍 Using base URL: %s", cls.base_url)
+        logger.debug("🔍 Test candidate email: %s", cls.candidate_email)
+        logger.debug("🔍 Test employer email: %s", cls.employer_email)
+        
+        # Register both users once; the registration tests assert on these responses
+        cls.candidate_registration = cls._register({
+            "email": cls.candidate_email,
+            "password": cls.password,
+            "role": "candidate",
+            "full_name": "Test Candidate",
+            "phone": "1234567890"
+        })
+        cls.employer_registration = cls._register({
+            "email": cls.employer_email,
+            "password": cls.password,
+            "role": "employer",
+            "full_name": "Test Employer",
+            "company_name": "Test Company",
+            "phone": "0987654321"
+        })
+        if cls.candidate_registration.status_code == 200:
+            response_data = _json(cls.candidate_registration)
+            cls.candidate_token = response_data["access_token"]
+            cls.candidate_headers = {"Authorization": f"Bearer {cls.candidate_token}"}
+            cls.candidate_user = response_data["user"]
+        if cls.employer_registration.status_code == 200:
+            response_data = _json(cls.employer_registration)
+            cls.employer_token = response_data["access_token"]
+            cls.employer_headers = {"Authorization": f"Bearer {cls.employer_token}"}
+            cls.employer_user = response_data["user"]
+
+    @classmethod
+    def _finish_recording(cls):
+        # Only a full, all-passing run may become the cassette later runs replay;
+        # a subset (-k) or failing run would freeze partial or error responses
+        if cls.passed_tests == set(unittest.TestLoader().getTestCaseNames(cls)):
+            _publish_recording(cls.run_id)
+        else:
+            logger.warning("Discarding recording %s: not every test passed", cls.run_id)
+            shutil.rmtree(VCR_DIR / cls.run_id, ignore_errors=True)
+
+    @classmethod
+    def _register(cls, data):
+        response = cls.session.post(cls.URL_REGISTER, json=data)
+        logger.debug("Register %s response status: %s", data["role"], response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %.200s...", response.text)
+        return response
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+
+    def _expect_ok(self, response):
+        """Fail with the request line and body unless the response is a 200"""
+        logger.debug("Response status: %s", response.status_code)
+        if response.status_code != 200:
+            request = response.request
+            self.fail(f"{request.method} {request.url} -> {response.status_code}: {response.text[:400]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %.200s...", response.text)
 
     def test_01_api_root(self):
         """Test the API root endpoint"""
-        print("\n🔍 Testing API root endpoint...")
-        response = requests.get(f"{self.base_url}/")
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        self.assertEqual(response.status_code, 200)
-        self.assertIn("message", response.json())
-        print("✅ API root endpoint test passed")
+        logger.debug("🔍 Testing API root endpoint...")
+        response = self.session.get(self.URL_ROOT)
+        self._expect_ok(response)
+        self.assertIn("message", _json(response))
+        logger.debug("✅ API root endpoint test passed")
 
     def test_02_register_candidate(self):
         """Test candidate registration"""
-        print("\n🔍 Testing candidate registration...")
-        data = {
-            "email": self.candidate_email,
-            "password": self.password,
-            "role": "candidate",
-            "full_name": "Test Candidate",
-            "phone": "1234567890"
-        }
-        response = requests.post(f"{self.base_url}/register", json=data)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
+        logger.debug("🔍 Testing candidate registration...")
+        response = self.candidate_registration
+        self._expect_ok(response)
+        response_data = _json(response)
         self.assertIn("access_token", response_data)
         self.assertIn("user", response_data)
         self.assertEqual(response_data["user"]["email"], self.candidate_email)
         self.assertEqual(response_data["user"]["role"], "candidate")
-        
-        # Save token and user for later tests
-        self.candidate_token = response_data["access_token"]
-        self.candidate_user = response_data["user"]
-        print(f"✅ Candidate registration test passed. Token: {self.candidate_token[:10]}...")
-        print(f"✅ Candidate user ID: {self.candidate_user['id']}")
+        logger.debug("✅ Candidate registration test passed. Token: %s...", self.candidate_token[:10])
+        logger.debug("✅ Candidate user ID: %s", self.candidate_user['id'])
 
     def test_03_register_employer(self):
         """Test employer registration"""
-        print("\n🔍 Testing employer registration...")
-        data = {
-            "email": self.employer_email,
-            "password": self.password,
-            "role": "employer",
-            "full_name": "Test Employer",
-            "company_name": "Test Company",
-            "phone": "0987654321"
-        }
-        response = requests.post(f"{self.base_url}/register", json=data)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
+        logger.debug("🔍 Testing employer registration...")
+        response = self.employer_registration
+        self._expect_ok(response)
+        response_data = _json(response)
         self.assertIn("access_token", response_data)
         self.assertIn("user", response_data)
         self.assertEqual(response_data["user"]["email"], self.employer_email)
         self.assertEqual(response_data["user"]["role"], "employer")
-        
-        # Save token and user for later tests
-        self.employer_token = response_data["access_token"]
-        self.employer_user = response_data["user"]
-        print(f"✅ Employer registration test passed. Token: {self.employer_token[:10]}...")
-        print(f"✅ Employer user ID: {self.employer_user['id']}")
+        logger.debug("✅ Employer registration test passed. Token: %s...", self.employer_token[:10])
+        logger.debug("✅ Employer user ID: %s", self.employer_user['id'])
 
     def test_04_login_candidate(self):
         """Test candidate login"""
-        print("\n🔍 Testing candidate login...")
+        logger.debug("🔍 Testing candidate login...")
         data = {
             "email": self.candidate_email,
             "password": self.password
         }
-        response = requests.post(f"{self.base_url}/login", json=data)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
+        response = self.session.post(self.URL_LOGIN, json=data)
+        self._expect_ok(response)
+        response_data = _json(response)
         self.assertIn("access_token", response_data)
         self.assertIn("user", response_data)
         self.assertEqual(response_data["user"]["email"], self.candidate_email)
         
         # Update token
-        self.candidate_token = response_data["access_token"]
-        print(f"✅ Candidate login test passed. Token: {self.candidate_token[:10]}...")
+        type(self).candidate_token = response_data["access_token"]
+        type(self).candidate_headers = {"Authorization": f"Bearer {self.candidate_token}"}
+        logger.debug("✅ Candidate login test passed. Token: %s...", self.candidate_token[:10])
 
     def test_05_login_employer(self):
         """Test employer login"""
-        print("\n🔍 Testing employer login...")
+        logger.debug("🔍 Testing employer login...")
         data = {
             "email": self.employer_email,
             "password": self.password
         }
-        response = requests.post(f"{self.base_url}/login", json=data)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        self.assertEqual(response.status_code, 200)
-        response_data = response.json()
+        response = self.session.post(self.URL_LOGIN, json=data)
+        self._expect_ok(response)
+        response_data = _json(response)
         self.assertIn("access_token", response_data)
         self.assertIn("user", response_data)
         self.assertEqual(response_data["user"]["email"], self.employer_email)
         
         # Update token
-        self.employer_token = response_data["access_token"]
-        print(f"✅ Employer login test passed. Token: {self.employer_token[:10]}...")
+        type(self).employer_token = response_data["access_token"]
+        type(self).employer_headers = {"Authorization": f"Bearer {self.employer_token}"}
+        logger.debug("✅ Employer login test passed. Token: %s...", self.employer_token[:10])
 
     def test_06_get_me(self):
         """Test get current user endpoint"""
-        print("\n🔍 Testing get current user endpoint...")
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.get(f"{self.base_url}/me", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get current user test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get current user test failed with status {response.status_code}")
-        
-        self.assertEqual(response.json()["email"], self.candidate_email)
-        print("✅ Get current user test passed")
+        logger.debug("🔍 Testing get current user endpoint...")
+        headers = self.candidate_headers
+        logger.debug("Using headers: %s", headers)
+        response = self.session.get(self.URL_ME, headers=headers)
+        self._expect_ok(response)
+        
+        self.assertEqual(_json(response)["email"], self.candidate_email)
+        logger.debug("✅ Get current user test passed")
 
     def test_07_create_job(self):
         """Test job creation by employer"""
-        print("\n🔍 Testing job creation...")
-        headers = {"Authorization": f"Bearer {self.employer_token}"}
-        print(f"Using headers: {headers}")
+        logger.debug("🔍 Testing job creation...")
+        headers = self.employer_headers
+        logger.debug("Using headers: %s", headers)
         data = {
             "title": f"Test Job {self.timestamp}",
             "company": "Test Company",
@@ -162,81 +306,26 @@ class JobPortalAPITest(unittest.TestCase):
             "requirements": ["Python", "React"],
             "job_type": "full-time"
         }
-        response = requests.post(f"{self.base_url}/jobs", json=data, headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Job creation test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Job creation test failed with status {response.status_code}")
+        response = self.session.post(self.URL_JOBS, json=data, headers=headers)
+        self._expect_ok(response)
         
-        response_data = response.json()
+        response_data = _json(response)
         self.assertEqual(response_data["title"], data["title"])
         self.assertEqual(response_data["employer_id"], self.employer_user["id"])
         
         # Save job ID for later tests
-        self.test_job_id = response_data["id"]
-        print(f"✅ Job creation test passed. Job ID: {self.test_job_id}")
-
-    def test_08_get_jobs(self):
-        """Test getting job listings"""
-        print("\n🔍 Testing job listings...")
-        response = requests.get(f"{self.base_url}/jobs")
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Job listings test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Job listings test failed with status {response.status_code}")
-        
-        jobs = response.json()
-        self.assertIsInstance(jobs, list)
-        
-        # Check if our test job is in the list
-        job_found = False
-        for job in jobs:
-            if job["id"] == self.test_job_id:
-                job_found = True
-                break
-        
-        if not job_found:
-            print(f"❌ Test job not found in job listings. Job ID: {self.test_job_id}")
-            print(f"Jobs found: {[job['id'] for job in jobs]}")
-        
-        self.assertTrue(job_found, "Test job not found in job listings")
-        print("✅ Job listings test passed")
-
-    def test_09_get_job_by_id(self):
-        """Test getting a specific job by ID"""
-        print("\n🔍 Testing get job by ID...")
-        if not self.test_job_id:
-            print("❌ No job ID available for testing")
-            self.skipTest("No job ID available")
-        
-        response = requests.get(f"{self.base_url}/jobs/{self.test_job_id}")
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get job by ID test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get job by ID test failed with status {response.status_code}")
-        
-        job = response.json()
-        self.assertEqual(job["id"], self.test_job_id)
-        print("✅ Get job by ID test passed")
+        type(self).test_job_id = response_data["id"]
+        logger.debug("✅ Job creation test passed. Job ID: %s", self.test_job_id)
 
     def test_10_update_job(self):
         """Test updating a job"""
-        print("\n🔍 Testing job update...")
+        logger.debug("🔍 Testing job update...")
         if not self.test_job_id:
-            print("❌ No job ID available for testing")
+            logger.warning("❌ No job ID available for testing")
             self.skipTest("No job ID available")
         
-        headers = {"Authorization": f"Bearer {self.employer_token}"}
-        print(f"Using headers: {headers}")
+        headers = self.employer_headers
+        logger.debug("Using headers: %s", headers)
         data = {
             "title": f"Updated Test Job {self.timestamp}",
             "company": "Test Company",
@@ -247,291 +336,167 @@ class JobPortalAPITest(unittest.TestCase):
             "requirements": ["Python", "React", "FastAPI"],
             "job_type": "full-time"
         }
-        response = requests.put(f"{self.base_url}/jobs/{self.test_job_id}", json=data, headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Job update test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Job update test failed with status {response.status_code}")
+        response = self.session.put(f"{self.URL_JOBS}/{self.test_job_id}", json=data, headers=headers)
+        self._expect_ok(response)
         
-        updated_job = response.json()
+        updated_job = _json(response)
         self.assertEqual(updated_job["title"], data["title"])
-        print("✅ Job update test passed")
+        logger.debug("✅ Job update test passed")
 
     def test_11_upload_resume(self):
         """Test resume upload"""
-        print("\n🔍 Testing resume upload...")
+        logger.debug("🔍 Testing resume upload...")
         if not self.candidate_token:
-            print("❌ No candidate token available for testing")
+            logger.warning("❌ No candidate token available for testing")
             self.skipTest("No candidate token available")
         
-        # Create a temporary PDF file
-        temp_file_path = "/tmp/test_resume.pdf"
-        with open(temp_file_path, "w") as f:
-            f.write("This is a test resume")
+        # Stream the in-memory test resume as the multipart body without buffering it
+        body = MultipartEncoder(fields={"file": ("test_resume.pdf", io.BytesIO(b"This is a test resume"), "application/pdf")})
+        headers = {**self.candidate_headers, "Content-Type": body.content_type}
+        logger.debug("Using headers: %s", headers)
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
-        
-        files = {"file": ("test_resume.pdf", open(temp_file_path, "rb"), "application/pdf")}
-        response = requests.post(
-            f"{self.base_url}/resumes/upload", 
-            files=files,
-            headers=headers
+        response = self.session.post(
+            self.URL_RESUME_UPLOAD, 
+            data=body,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT
         )
         
-        # Clean up the temporary file
-        os.remove(temp_file_path)
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
+        self._expect_ok(response)
         
-        if response.status_code != 200:
-            print(f"❌ Resume upload test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Resume upload test failed with status {response.status_code}")
-        
-        resume_data = response.json()
+        resume_data = _json(response)
         self.assertEqual(resume_data["user_id"], self.candidate_user["id"])
         
         # Save resume ID for later tests
-        self.test_resume_id = resume_data["id"]
-        print(f"✅ Resume upload test passed. Resume ID: {self.test_resume_id}")
-
-    def test_12_get_resumes(self):
-        """Test getting user resumes"""
-        print("\n🔍 Testing get user resumes...")
-        if not self.candidate_token:
-            print("❌ No candidate token available for testing")
-            self.skipTest("No candidate token available")
-        
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.get(f"{self.base_url}/resumes", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get user resumes test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get user resumes test failed with status {response.status_code}")
-        
-        resumes = response.json()
-        self.assertIsInstance(resumes, list)
-        
-        # Check if our test resume is in the list
-        resume_found = False
-        for resume in resumes:
-            if resume["id"] == self.test_resume_id:
-                resume_found = True
-                break
-        
-        if not resume_found:
-            print(f"❌ Test resume not found in user resumes. Resume ID: {self.test_resume_id}")
-            print(f"Resumes found: {[resume['id'] for resume in resumes]}")
-        
-        self.assertTrue(resume_found, "Test resume not found in user resumes")
-        print("✅ Get user resumes test passed")
+        type(self).test_resume_id = resume_data["id"]
+        logger.debug("✅ Resume upload test passed. Resume ID: %s", self.test_resume_id)
 
     def test_13_apply_for_job(self):
         """Test applying for a job"""
-        print("\n🔍 Testing job application...")
+        logger.debug("🔍 Testing job application...")
         if not self.candidate_token or not self.test_job_id or not self.test_resume_id:
-            print("❌ Missing required data for testing job application")
+            logger.warning("❌ Missing required data for testing job application")
             self.skipTest("Missing required data")
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
+        headers = self.candidate_headers
+        logger.debug("Using headers: %s", headers)
         data = {
             "job_id": self.test_job_id,
             "resume_id": self.test_resume_id,
             "cover_letter": "This is a test cover letter"
         }
-        response = requests.post(f"{self.base_url}/applications", json=data, headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Job application test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Job application test failed with status {response.status_code}")
+        response = self.session.post(self.URL_APPS, json=data, headers=headers)
+        self._expect_ok(response)
         
-        application_data = response.json()
+        application_data = _json(response)
         self.assertEqual(application_data["job_id"], self.test_job_id)
         self.assertEqual(application_data["resume_id"], self.test_resume_id)
         self.assertEqual(application_data["candidate_id"], self.candidate_user["id"])
         
         # Save application ID for later tests
-        self.test_application_id = application_data["id"]
-        print(f"✅ Job application test passed. Application ID: {self.test_application_id}")
+        type(self).test_application_id = application_data["id"]
+        logger.debug("✅ Job application test passed. Application ID: %s", self.test_application_id)
 
-    def test_14_get_applications_candidate(self):
-        """Test getting applications as a candidate"""
-        print("\n🔍 Testing get applications as candidate...")
-        if not self.candidate_token:
-            print("❌ No candidate token available for testing")
-            self.skipTest("No candidate token available")
-        
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.get(f"{self.base_url}/applications", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get applications as candidate test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get applications as candidate test failed with status {response.status_code}")
-        
-        applications = response.json()
-        self.assertIsInstance(applications, list)
-        
-        # Check if our test application is in the list
-        application_found = False
-        for app in applications:
-            if app["id"] == self.test_application_id:
-                application_found = True
-                break
-        
-        if not application_found:
-            print(f"❌ Test application not found in candidate applications. Application ID: {self.test_application_id}")
-            print(f"Applications found: {[app['id'] for app in applications]}")
-        
-        self.assertTrue(application_found, "Test application not found in candidate applications")
-        print("✅ Get applications as candidate test passed")
-
-    def test_15_get_applications_employer(self):
-        """Test getting applications as an employer"""
-        print("\n🔍 Testing get applications as employer...")
-        if not self.employer_token:
-            print("❌ No employer token available for testing")
-            self.skipTest("No employer token available")
-        
-        headers = {"Authorization": f"Bearer {self.employer_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.get(f"{self.base_url}/applications", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get applications as employer test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get applications as employer test failed with status {response.status_code}")
-        
-        applications = response.json()
-        self.assertIsInstance(applications, list)
-        
-        # Check if our test application is in the list
-        application_found = False
-        for app in applications:
-            if app["id"] == self.test_application_id:
-                application_found = True
-                break
-        
-        if not application_found:
-            print(f"❌ Test application not found in employer applications. Application ID: {self.test_application_id}")
-            print(f"Applications found: {[app['id'] for app in applications]}")
+    def test_13b_download_resume(self):
+        """Test downloading a resume as its owner and as the employer it was sent to"""
+        logger.debug("🔍 Testing resume download...")
+        if not self.test_resume_id or not self.test_application_id:
+            logger.warning("❌ Missing required data for testing resume download")
+            self.skipTest("Missing required data")
         
-        self.assertTrue(application_found, "Test application not found in employer applications")
-        print("✅ Get applications as employer test passed")
+        url = f"{self.URL_RESUMES}/{self.test_resume_id}/download"
+        for headers in (self.candidate_headers, self.employer_headers):
+            response = self.session.get(url, headers=headers)
+            self._expect_ok(response)
+            self.assertEqual(response.content, b"This is a test resume")
+        logger.debug("✅ Resume download test passed")
 
-    def test_16_get_application_by_id(self):
-        """Test getting a specific application by ID"""
-        print("\n🔍 Testing get application by ID...")
-        if not self.candidate_token or not self.test_application_id:
-            print("❌ Missing required data for testing get application by ID")
+    def test_14_parallel_reads(self):
+        """Test the job, resume and application reads concurrently over one HTTP/2 connection"""
+        logger.debug("🔍 Testing parallel reads...")
+        if not self.candidate_token or not self.employer_token or not self.test_application_id:
+            logger.warning("❌ Missing required data for testing parallel reads")
             self.skipTest("Missing required data")
         
-        headers = {"Authorization": f"Bearer {self.candidate_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.get(f"{self.base_url}/applications/{self.test_application_id}", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Get application by ID test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Get application by ID test failed with status {response.status_code}")
+        responses = asyncio.run(self._parallel_reads())
+        for response in responses:
+            self._expect_ok(response)
         
-        application = response.json()
+        jobs, job, resumes, candidate_apps, employer_apps, application = [_json(r) for r in responses]
+        for listing in (jobs, resumes, candidate_apps, employer_apps):
+            self.assertIsInstance(listing, list)
+        self.assertIn(self.test_job_id, {j["id"] for j in jobs}, "Test job not found in job listings")
+        self.assertEqual(job["id"], self.test_job_id)
+        self.assertIn(self.test_resume_id, {r["id"] for r in resumes}, "Test resume not found in user resumes")
+        self.assertIn(self.test_application_id, {a["id"] for a in candidate_apps}, "Test application not found in candidate applications")
+        self.assertIn(self.test_application_id, {a["id"] for a in employer_apps}, "Test application not found in employer applications")
         self.assertEqual(application["id"], self.test_application_id)
-        print("✅ Get application by ID test passed")
+        logger.debug("✅ Parallel reads test passed")
+
+    async def _parallel_reads(self):
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, http2=True, timeout=REQUEST_TIMEOUT) as client:
+            return await asyncio.gather(
+                client.get("/jobs"),
+                client.get(f"/jobs/{self.test_job_id}"),
+                client.get("/resumes", headers=self.candidate_headers),
+                client.get("/applications", headers=self.candidate_headers),
+                client.get("/applications", headers=self.employer_headers),
+                client.get(f"/applications/{self.test_application_id}", headers=self.candidate_headers),
+            )
 
     def test_17_update_application_status(self):
         """Test updating application status"""
-        print("\n🔍 Testing update application status...")
+        logger.debug("🔍 Testing update application status...")
         if not self.employer_token or not self.test_application_id:
-            print("❌ Missing required data for testing update application status")
+            logger.warning("❌ Missing required data for testing update application status")
             self.skipTest("Missing required data")
         
-        headers = {"Authorization": f"Bearer {self.employer_token}"}
-        print(f"Using headers: {headers}")
+        headers = self.employer_headers
+        logger.debug("Using headers: %s", headers)
         data = {"status": "accepted"}
-        response = requests.put(
-            f"{self.base_url}/applications/{self.test_application_id}/status", 
+        response = self.session.put(
+            f"{self.URL_APPS}/{self.test_application_id}/status", 
             data=data,
             headers=headers
         )
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
+        self._expect_ok(response)
         
-        if response.status_code != 200:
-            print(f"❌ Update application status test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Update application status test failed with status {response.status_code}")
-        
-        updated_application = response.json()
+        updated_application = _json(response)
         self.assertEqual(updated_application["status"], "accepted")
-        print("✅ Update application status test passed")
+        logger.debug("✅ Update application status test passed")
 
     def test_18_delete_job(self):
         """Test deleting a job (soft delete)"""
-        print("\n🔍 Testing job deletion...")
+        logger.debug("🔍 Testing job deletion...")
         if not self.employer_token or not self.test_job_id:
-            print("❌ Missing required data for testing job deletion")
+            logger.warning("❌ Missing required data for testing job deletion")
             self.skipTest("Missing required data")
         
-        headers = {"Authorization": f"Bearer {self.employer_token}"}
-        print(f"Using headers: {headers}")
-        response = requests.delete(f"{self.base_url}/jobs/{self.test_job_id}", headers=headers)
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text[:200]}...")
-        
-        if response.status_code != 200:
-            print(f"❌ Job deletion test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            self.fail(f"Job deletion test failed with status {response.status_code}")
+        headers = self.employer_headers
+        logger.debug("Using headers: %s", headers)
+        response = self.session.delete(f"{self.URL_JOBS}/{self.test_job_id}", headers=headers)
+        self._expect_ok(response)
         
-        self.assertIn("message", response.json())
+        self.assertIn("message", _json(response))
         
         # Verify the job is soft deleted (is_active = False)
-        response = requests.get(f"{self.base_url}/jobs/{self.test_job_id}")
+        response = self.session.get(f"{self.URL_JOBS}/{self.test_job_id}")
         self.assertEqual(response.status_code, 404)
-        print("✅ Job deletion test passed")
+        logger.debug("✅ Job deletion test passed")
+
+def _record_pass(test):
+    @functools.wraps(test)
+    def wrapper(self):
+        test(self)
+        type(self).passed_tests.add(test.__name__)
+    return wrapper
+
+# Track which tests returned normally (not failed or skipped) for _finish_recording
+for _name in unittest.TestLoader().getTestCaseNames(JobPortalAPITest):
+    setattr(JobPortalAPITest, _name, _record_pass(getattr(JobPortalAPITest, _name)))
 
 if __name__ == "__main__":
-    # Run the tests in order
-    test_suite = unittest.TestSuite()
-    test_suite.addTest(JobPortalAPITest("test_01_api_root"))
-    test_suite.addTest(JobPortalAPITest("test_02_register_candidate"))
-    test_suite.addTest(JobPortalAPITest("test_03_register_employer"))
-    test_suite.addTest(JobPortalAPITest("test_04_login_candidate"))
-    test_suite.addTest(JobPortalAPITest("test_05_login_employer"))
-    test_suite.addTest(JobPortalAPITest("test_06_get_me"))
-    test_suite.addTest(JobPortalAPITest("test_07_create_job"))
-    test_suite.addTest(JobPortalAPITest("test_08_get_jobs"))
-    test_suite.addTest(JobPortalAPITest("test_09_get_job_by_id"))
-    test_suite.addTest(JobPortalAPITest("test_10_update_job"))
-    test_suite.addTest(JobPortalAPITest("test_11_upload_resume"))
-    test_suite.addTest(JobPortalAPITest("test_12_get_resumes"))
-    test_suite.addTest(JobPortalAPITest("test_13_apply_for_job"))
-    test_suite.addTest(JobPortalAPITest("test_14_get_applications_candidate"))
-    test_suite.addTest(JobPortalAPITest("test_15_get_applications_employer"))
-    test_suite.addTest(JobPortalAPITest("test_16_get_application_by_id"))
-    test_suite.addTest(JobPortalAPITest("test_17_update_application_status"))
-    test_suite.addTest(JobPortalAPITest("test_18_delete_job"))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    runner.run(test_suite)
\ No newline at end of file
+    # Tests are named test_01..test_18 so the loader's name sort runs them in order
+    suite = unittest.TestLoader().loadTestsFromTestCase(JobPortalAPITest)
+    unittest.TextTestRunner(verbosity=2).run(suite)